@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""테스트 스크립트들이 공유하는 Playwright 드라이버 싱글턴.
+
+각 스크립트가 자체적으로 sync_playwright()를 열면 드라이버 노드 프로세스가
+스크립트마다 새로 뜬다(~수백 ms). 같은 프로세스에서 여러 스크립트를 순차
+실행할 때 첫 호출만 기동 비용을 내도록 드라이버를 모듈 수준에서 공유한다.
+"""
+from __future__ import annotations
+
+import atexit
+import threading
+
+from playwright.sync_api import Playwright, sync_playwright
+
+_lock = threading.Lock()
+_manager = None
+_playwright: Playwright | None = None
+
+
+def get_playwright() -> Playwright:
+    """공유 드라이버를 반환한다. 첫 호출에서만 기동하고 프로세스 종료 시 정리한다."""
+    global _manager, _playwright
+    with _lock:
+        if _playwright is None:
+            _manager = sync_playwright()
+            _playwright = _manager.start()
+            atexit.register(_stop)
+        return _playwright
+
+
+def _stop() -> None:
+    global _manager, _playwright
+    with _lock:
+        if _playwright is not None:
+            _playwright.stop()
+            _manager = None
+            _playwright = None
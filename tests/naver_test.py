@@ -2,7 +2,7 @@ import re
 import os
 import yaml
 from pathlib import Path
-from playwright.sync_api import Playwright, sync_playwright, expect
+from playwright.sync_api import Playwright, expect
 
 
 def load_config():
@@ -36,8 +36,9 @@ def load_credentials_from_excel():
     sheet_name = config['excel']['sheet_name']
     columns = config['excel']['columns']
 
-    # Excel 파일 읽기
-    df = pl.read_excel(str(excel_path), sheet_name=sheet_name)
+    # Excel 파일 읽기 (필요한 컬럼만 읽어 파싱/메모리 비용 절감)
+    required_columns = [columns['subject'], columns['username'], columns['password']]
+    df = pl.read_excel(str(excel_path), sheet_name=sheet_name, columns=required_columns)
 
     # subject 필터링
     filtered = df.filter(pl.col(columns['subject']) == target_subject)
@@ -79,5 +80,10 @@ def run(playwright: Playwright) -> None:
     browser.close()
 
 
-with sync_playwright() as playwright:
-    run(playwright)
+try:
+    # 공유 드라이버를 써서 같은 프로세스의 후속 스크립트는 기동 비용을 내지 않는다.
+    from _driver import get_playwright
+except ImportError:
+    from tests._driver import get_playwright
+
+run(get_playwright())
@@ -1,633 +1,995 @@
-# -*- coding: utf-8 -*-
-from __future__ import annotations
-
-import time
-from pathlib import Path
-
-import yaml
-from playwright.sync_api import Error as PlaywrightError
-from playwright.sync_api import Playwright, sync_playwright, TimeoutError as PlaywrightTimeoutError
-
-
-ROOT = Path(__file__).resolve().parents[1]
-
-
-def load_config() -> dict:
-    config_path = ROOT / "config.yaml"
-    with config_path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle)
-
-
-def ensure_progress_dir(path: Path) -> None:
-    path.mkdir(parents=True, exist_ok=True)
-
-
-def step_delay(page, timeout_ms: int | None) -> None:
-    if timeout_ms and timeout_ms > 0:
-        if hasattr(page, "is_closed") and page.is_closed():
-            return
-        try:
-            page.wait_for_timeout(timeout_ms)
-        except PlaywrightError:
-            pass
-
-
-def wait_for_manual_close(page, keep_open: bool, poll_ms: int) -> None:
-    if not keep_open:
-        return
-    wait_ms = poll_ms if poll_ms and poll_ms > 0 else 1000
-    try:
-        while True:
-            if hasattr(page, "is_closed") and page.is_closed():
-                break
-            try:
-                page.wait_for_timeout(wait_ms)
-            except PlaywrightError:
-                break
-    except KeyboardInterrupt:
-        pass
-
-
-def set_input_value(page, selector: str, value: str, timeout_ms: int | None = None) -> bool:
-    if value is None:
-        return False
-    updated = page.evaluate(
-        """(payload) => {
-            const el = document.querySelector(payload.selector);
-            if (!el) return false;
-            el.value = payload.value;
-            el.dispatchEvent(new Event('input', { bubbles: true }));
-            el.dispatchEvent(new Event('change', { bubbles: true }));
-            return true;
-        }""",
-        {"selector": selector, "value": value},
-    )
-    if updated:
-        step_delay(page, timeout_ms)
-    return updated
-
-
-def set_select_value(page, selector: str, value: str, timeout_ms: int | None = None) -> bool:
-    if value is None:
-        return False
-    updated = page.evaluate(
-        """(payload) => {
-            const el = document.querySelector(payload.selector);
-            if (!el) return false;
-            el.value = payload.value;
-            el.dispatchEvent(new Event('change', { bubbles: true }));
-            return true;
-        }""",
-        {"selector": selector, "value": value},
-    )
-    if updated:
-        step_delay(page, timeout_ms)
-    return updated
-
-
-def click_selector(page, selector: str, timeout_ms: int | None = None) -> bool:
-    clicked = page.evaluate(
-        """(sel) => {
-            const el = document.querySelector(sel);
-            if (!el) return false;
-            el.click();
-            return true;
-        }""",
-        selector,
-    )
-    if clicked:
-        step_delay(page, timeout_ms)
-    return clicked
-
-
-def click_link_by_text(
-    page, text: str, container_selector: str | None = None, timeout_ms: int | None = None
-) -> bool:
-    clicked = page.evaluate(
-        """(payload) => {
-            const root = payload.container ? document.querySelector(payload.container) : document;
-            if (!root) return false;
-            const links = Array.from(root.querySelectorAll('a'));
-            const target = links.find(link => (link.textContent || '').includes(payload.text));
-            if (!target) return false;
-            target.click();
-            return true;
-        }""",
-        {"text": text, "container": container_selector},
-    )
-    if clicked:
-        step_delay(page, timeout_ms)
-    return clicked
-
-
-def click_visible_element_by_text(
-    page, selectors: list[str], text_tokens: list[str], timeout_ms: int | None = None
-) -> bool:
-    if not selectors:
-        return False
-    clicked = page.evaluate(
-        """(payload) => {
-            const isVisible = (el) => {
-                if (!el) return false;
-                const style = window.getComputedStyle(el);
-                if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') return false;
-                const rect = el.getBoundingClientRect();
-                return rect.width > 0 && rect.height > 0;
-            };
-            const tokens = payload.text_tokens || [];
-            const matchesText = (el) => {
-                if (tokens.length === 0) return true;
-                const text = (el.textContent || el.value || '').trim();
-                return tokens.some(token => text.includes(token));
-            };
-            for (const selector of payload.selectors || []) {
-                const elements = Array.from(document.querySelectorAll(selector));
-                for (const el of elements) {
-                    if (el.disabled) continue;
-                    if (!isVisible(el)) continue;
-                    if (!matchesText(el)) continue;
-                    el.click();
-                    return true;
-                }
-            }
-            return false;
-        }""",
-        {"selectors": selectors, "text_tokens": text_tokens or []},
-    )
-    if clicked:
-        step_delay(page, timeout_ms)
-    return clicked
-
-
-def remove_modal_and_login(page, config: dict, timeout_ms: int | None = None) -> dict:
-    epost_cfg = config["epost"]
-    script_cfg = epost_cfg["script"]
-    # 로그인 단계에서만 사용하는 설정(Working process 이전)
-    login_cfg = script_cfg["login"]
-    creds = script_cfg["credentials"]
-    payload = {
-        "modal_selector": login_cfg["modal_selector"],
-        "id_selectors": login_cfg["id_selectors"],
-        "pw_selectors": login_cfg["password_selectors"],
-        "username": creds["username"],
-        "password": creds["password"],
-    }
-    result = page.evaluate(
-        """(payload) => {
-            const modal = document.querySelector(payload.modal_selector);
-            if (modal) {
-                modal.style.display = 'none';
-                modal.remove();
-            }
-
-            const selectFirst = (selectors) => {
-                for (const sel of selectors) {
-                    const el = document.querySelector(sel);
-                    if (el) return el;
-                }
-                return null;
-            };
-
-            const idInput = selectFirst(payload.id_selectors);
-            const pwInput = selectFirst(payload.pw_selectors);
-
-            if (idInput) {
-                idInput.value = payload.username;
-                idInput.dispatchEvent(new Event('input', { bubbles: true }));
-            }
-            if (pwInput) {
-                pwInput.value = payload.password;
-                pwInput.dispatchEvent(new Event('input', { bubbles: true }));
-            }
-
-            let submitted = false;
-            if (typeof checkVal === 'function') {
-                checkVal();
-                submitted = true;
-            } else {
-                const form = document.querySelector('#frmLogin');
-                if (form) {
-                    form.submit();
-                    submitted = true;
-                }
-            }
-
-            return {
-                id_found: !!idInput,
-                pw_found: !!pwInput,
-                submitted,
-            };
-        }""",
-        payload,
-    )
-    step_delay(page, timeout_ms)
-    return result
-
-
-def attach_dialog_handler(page, accept_contains: list[str]) -> None:
-    def _handler(dialog) -> None:
-        message = dialog.message
-        if any(token in message for token in accept_contains):
-            dialog.accept()
-        else:
-            dialog.dismiss()
-
-    page.on("dialog", _handler)
-
-
-def attach_popup_closer(context, url_contains: list[str], timeout_ms: int) -> None:
-    def _handler(popup) -> None:
-        try:
-            popup.wait_for_load_state(timeout=timeout_ms)
-        except PlaywrightTimeoutError:
-            pass
-        if any(token in popup.url for token in url_contains):
-            popup.close()
-
-    context.on("page", _handler)
-
-
-def toggle_address_popup_trigger(page, config: dict, click: bool, timeout_ms: int | None = None) -> bool:
-    epost_cfg = config["epost"]
-    process_cfg = epost_cfg["working_process"]
-    popup_cfg = process_cfg["address_popup"]
-    payload = {
-        "click": click,
-        "onclick_contains": popup_cfg["trigger_onclick_contains"],
-        "text_contains": popup_cfg["trigger_text_contains"],
-    }
-    clicked = page.evaluate(
-        """(payload) => {
-            const findLink = () => {
-                if (payload.onclick_contains) {
-                    const match = Array.from(document.querySelectorAll('a')).find(
-                        (link) => (link.getAttribute('onclick') || '').includes(payload.onclick_contains)
-                    );
-                    if (match) return match;
-                }
-                if (payload.text_contains) {
-                    const match = Array.from(document.querySelectorAll('a')).find(
-                        (link) => (link.textContent || '').includes(payload.text_contains)
-                    );
-                    if (match) return match;
-                }
-                return null;
-            };
-
-            const link = findLink();
-            if (!link) return false;
-            if (payload.click) link.click();
-            return true;
-        }""",
-        payload,
-    )
-    if clicked and click:
-        step_delay(page, timeout_ms)
-    return clicked
-
-
-def open_address_popup(page, config: dict, timeout_ms: int):
-    script_cfg = config["epost"]["script"]
-    popup_timeout_ms = script_cfg["timeouts_ms"]["popup"]
-    if not toggle_address_popup_trigger(page, config, False):
-        raise RuntimeError("주소찾기 링크를 찾지 못했습니다.")
-
-    try:
-        with page.expect_popup(timeout=popup_timeout_ms) as popup_info:
-            toggle_address_popup_trigger(page, config, True, timeout_ms)
-        return popup_info.value
-    except PlaywrightTimeoutError as exc:
-        raise RuntimeError("주소찾기 팝업이 열리지 않았습니다.") from exc
-
-
-def fill_address_popup(page, config: dict, timeout_ms: int) -> None:
-    epost_cfg = config["epost"]
-    process_cfg = epost_cfg["working_process"]
-    popup_cfg = process_cfg["address_popup"]
-    keyword_selector = popup_cfg["keyword_selector"]
-    page.locator(keyword_selector).fill(popup_cfg["keyword"])
-    step_delay(page, timeout_ms)
-    clicked = click_visible_element_by_text(
-        page,
-        popup_cfg.get("search_button_selectors", []),
-        popup_cfg.get("search_button_text_contains", []),
-        timeout_ms,
-    )
-    if not clicked:
-        page.locator(keyword_selector).press("Enter")
-        step_delay(page, timeout_ms)
-    page.wait_for_timeout(timeout_ms)
-
-    found = page.evaluate(
-        """(text) => {
-            const links = Array.from(document.querySelectorAll('a'));
-            const target = links.find(link => (link.textContent || '').includes(text));
-            if (!target) return false;
-            target.click();
-            return true;
-        }""",
-        popup_cfg["result_text_contains"],
-    )
-    if found:
-        step_delay(page, timeout_ms)
-    if not found:
-        raise RuntimeError("주소 검색 결과를 찾지 못했습니다.")
-
-    page.evaluate(
-        """(payload) => {
-            const inputs = Array.from(document.querySelectorAll('input[type="text"]'));
-            for (const input of inputs) {
-                if (input.placeholder && input.placeholder.includes('동')) {
-                    input.value = payload.building;
-                    input.dispatchEvent(new Event('input', { bubbles: true }));
-                } else if (input.placeholder && input.placeholder.includes('호')) {
-                    input.value = payload.unit;
-                    input.dispatchEvent(new Event('input', { bubbles: true }));
-                }
-            }
-        }""",
-        {"building": popup_cfg["building"], "unit": popup_cfg["unit"]},
-    )
-    step_delay(page, timeout_ms)
-
-    clicked = page.evaluate(
-        """(text) => {
-            const links = Array.from(document.querySelectorAll('a'));
-            const target = links.find(link => (link.textContent || '').includes(text));
-            if (!target) return false;
-            target.click();
-            return true;
-        }""",
-        popup_cfg["submit_text_contains"],
-    )
-    if clicked:
-        step_delay(page, timeout_ms)
-    if not clicked:
-        raise RuntimeError("주소 팝업 입력 버튼을 찾지 못했습니다.")
-
-
-def open_address_book_popup(page, config: dict, timeout_ms: int):
-    epost_cfg = config["epost"]
-    process_cfg = epost_cfg["working_process"]
-    address_book_cfg = process_cfg["address_book"]
-    popup_timeout_ms = epost_cfg["script"]["timeouts_ms"]["popup"]
-    try:
-        with page.expect_popup(timeout=popup_timeout_ms) as popup_info:
-            clicked = click_link_by_text(page, address_book_cfg["search_text"], timeout_ms=timeout_ms)
-        if not clicked:
-            raise RuntimeError("주소록 검색 링크를 찾지 못했습니다.")
-        return popup_info.value
-    except PlaywrightTimeoutError as exc:
-        raise RuntimeError("주소록 팝업이 열리지 않았습니다.") from exc
-
-
-def open_item_info_popup(page, config: dict, timeout_ms: int):
-    epost_cfg = config["epost"]
-    process_cfg = epost_cfg["working_process"]
-    item_info_cfg = process_cfg["item_info"]
-    popup_timeout_ms = epost_cfg["script"]["timeouts_ms"]["popup"]
-    try:
-        with page.expect_popup(timeout=popup_timeout_ms) as popup_info:
-            clicked = click_link_by_text(page, item_info_cfg["popup_trigger_text"], timeout_ms=timeout_ms)
-        if not clicked:
-            raise RuntimeError("물품정보 불러오기 링크를 찾지 못했습니다.")
-        return popup_info.value
-    except PlaywrightTimeoutError as exc:
-        raise RuntimeError("물품정보 팝업이 열리지 않았습니다.") from exc
-
-
-def select_item_in_popup(page, item_text: str, timeout_ms: int | None = None) -> None:
-    clicked = click_link_by_text(page, item_text, timeout_ms=timeout_ms)
-    if not clicked:
-        raise RuntimeError("물품정보 팝업에서 품목을 찾지 못했습니다.")
-    step_delay(page, timeout_ms)
-    try:
-        if hasattr(page, "is_closed") and page.is_closed():
-            return
-        page.close()
-    except PlaywrightError:
-        pass
-
-
-def add_to_recipient_list(page, config: dict, timeout_ms: int | None = None) -> None:
-    process_cfg = config["epost"]["working_process"]
-    recipient_list_cfg = process_cfg["recipient_list"]
-    clicked = click_link_by_text(page, recipient_list_cfg["add_button_text"], timeout_ms=timeout_ms)
-    if not clicked:
-        raise RuntimeError("받는 분 목록에 추가 링크를 찾지 못했습니다.")
-
-
-def validate_address(page, config: dict, timeout_ms: int | None = None) -> None:
-    process_cfg = config["epost"]["working_process"]
-    validation_cfg = process_cfg["address_validation"]
-    clicked = click_link_by_text(page, validation_cfg["button_text"], timeout_ms=timeout_ms)
-    if not clicked:
-        raise RuntimeError("주소검증 링크를 찾지 못했습니다.")
-
-
-def address_book_is_empty(page, empty_tokens: list[str]) -> bool:
-    if not empty_tokens:
-        return False
-    return page.evaluate(
-        """(tokens) => {
-            const bodyText = document.body ? (document.body.innerText || '') : '';
-            return tokens.some(token => bodyText.includes(token));
-        }""",
-        empty_tokens,
-    )
-
-
-def fill_manual_recipient(page, config: dict, timeouts: dict) -> None:
-    epost_cfg = config["epost"]
-    process_cfg = epost_cfg["working_process"]
-    recipient_cfg = process_cfg["recipient"]
-    set_input_value(page, 'input[name="receiverName"]', recipient_cfg["name"], timeouts["action"])
-    page2 = open_address_popup(page, config, timeouts["action"])
-    fill_address_popup(page2, config, timeouts["action"])
-    step_delay(page2, timeouts["action"])
-    page2.close()
-    set_input_value(page, 'input[name="reDetailAddr"]', recipient_cfg["detail_address"], timeouts["action"])
-    phone_parts = recipient_cfg["phone"]["mobile"]
-    set_input_value(page, "#reCell1", phone_parts[0], timeouts["action"])
-    set_input_value(page, "#reCell2", phone_parts[1], timeouts["action"])
-    set_input_value(page, "#reCell3", phone_parts[2], timeouts["action"])
-
-
-def run(playwright: Playwright) -> None:
-    config = load_config()
-    epost_cfg = config["epost"]
-    script_cfg = epost_cfg["script"]
-    process_cfg = epost_cfg["working_process"]
-    # script_cfg: 기본 스크립트 설정 / process_cfg: 로그인 이후 작업(working process)
-    timeouts = script_cfg["timeouts_ms"]
-    progress_dir = ROOT / script_cfg["paths"]["progress_dir"]
-    ensure_progress_dir(progress_dir)
-    keep_open_after_run = script_cfg["browser"].get("keep_open_after_run", False)
-    keep_open_poll_ms = timeouts.get("keep_open_poll_ms", 1000)
-
-    browser = playwright.chromium.launch(
-        headless=script_cfg["browser"]["headless"],
-        args=script_cfg["browser"]["args"],
-    )
-    context = browser.new_context()
-    attach_popup_closer(context, script_cfg["popups"]["close_url_contains"], timeouts["popup"])
-    page = context.new_page()
-    attach_dialog_handler(page, script_cfg["login"]["accept_dialog_contains"])
-
-    error: Exception | None = None
-    try:
-        page.goto(script_cfg["urls"]["login"], wait_until="domcontentloaded")
-        page.wait_for_timeout(timeouts["page_stabilize"])
-
-        login_result = remove_modal_and_login(page, config, timeouts["action"])
-        if not login_result["id_found"] or not login_result["pw_found"]:
-            raise RuntimeError("로그인 입력창을 찾지 못했습니다.")
-        if not login_result["submitted"]:
-            raise RuntimeError("로그인 제출에 실패했습니다.")
-
-        try:
-            page.wait_for_url("**/main.retrieveMainPage.comm", timeout=timeouts["login_wait"])
-        except PlaywrightTimeoutError as exc:
-            raise RuntimeError("로그인 완료 페이지로 이동하지 못했습니다.") from exc
-        step_delay(page, timeouts["action"])
-
-        page.goto(script_cfg["urls"]["parcel_reservation"], wait_until="domcontentloaded")
-        page.wait_for_timeout(timeouts["page_stabilize"])
-
-        agree_text = process_cfg["parcel"]["agree_checkbox_text"]
-        checked = page.evaluate(
-            """(text) => {
-                const checkboxes = Array.from(document.querySelectorAll('input[type="checkbox"]'));
-                for (const checkbox of checkboxes) {
-                    const container = checkbox.closest('label') || checkbox.parentElement;
-                    const labelText = container ? container.textContent || '' : '';
-                    if (labelText.includes(text)) {
-                        if (!checkbox.checked) checkbox.click();
-                        return true;
-                    }
-                }
-                const fallback = document.querySelector('input[type="checkbox"]');
-                if (fallback && !fallback.checked) {
-                    fallback.click();
-                    return true;
-                }
-                return false;
-            }""",
-            agree_text,
-        )
-        if checked:
-            step_delay(page, timeouts["action"])
-        if not checked:
-            raise RuntimeError("필수 확인 체크박스를 선택하지 못했습니다.")
-
-        if not set_select_value(
-            page,
-            'select[name="wishReceiptTime"]',
-            process_cfg["parcel"]["wish_receipt_date"],
-            timeouts["action"],
-        ):
-            raise RuntimeError("방문일 선택 필드를 찾지 못했습니다.")
-        if not set_select_value(
-            page,
-            'select[name="wishReceiptTimeNm"]',
-            process_cfg["parcel"]["wish_receipt_time"],
-            timeouts["action"],
-        ):
-            raise RuntimeError("방문시간 선택 필드를 찾지 못했습니다.")
-        if not set_select_value(
-            page,
-            'select[name="pickupKeep"]',
-            process_cfg["parcel"]["pickup_keep_code"],
-            timeouts["action"],
-        ):
-            raise RuntimeError("보관방법 선택 필드를 찾지 못했습니다.")
-        set_input_value(
-            page, 'input[name="pickupKeepNm"]', process_cfg["parcel"]["pickup_keep_note"], timeouts["action"]
-        )
-
-        set_select_value(page, "#tmpWght1", process_cfg["parcel"]["weight_code"], timeouts["action"])
-        set_select_value(page, "#tmpVol1", process_cfg["parcel"]["volume_code"], timeouts["action"])
-        set_select_value(page, "#labProductCode", process_cfg["parcel"]["product_code"], timeouts["action"])
-
-        click_selector(page, "#pickupSaveBtn", timeouts["action"])
-        click_link_by_text(page, "다음", "#pickupInfoDiv", timeouts["action"])
-
-        recipient_cfg = process_cfg["recipient"]
-        manual_entry_required = not recipient_cfg["use_address_book"]
-        if recipient_cfg["use_address_book"]:
-            address_book_cfg = process_cfg["address_book"]
-            page4 = open_address_book_popup(page, config, timeouts["action"])
-            page4.locator("select").first.select_option(recipient_cfg["address_book_group_value"])
-            step_delay(page4, timeouts["action"])
-            page4.get_by_text(address_book_cfg["confirm_text"]).first.click()
-            step_delay(page4, timeouts["action"])
-            page4.wait_for_load_state("domcontentloaded")
-            page4.once("dialog", lambda dialog: dialog.dismiss())
-            if address_book_is_empty(page4, address_book_cfg["empty_text_contains"]):
-                manual_entry_required = True
-                step_delay(page4, timeouts["action"])
-                page4.close()
-            else:
-                name_locator = page4.get_by_text(recipient_cfg["name"])
-                if name_locator.count() == 0:
-                    manual_entry_required = True
-                else:
-                    name_locator.first.click()
-                    step_delay(page4, timeouts["action"])
-                page4.close()
-        if manual_entry_required:
-            fill_manual_recipient(page, config, timeouts)
-
-        item_info_cfg = process_cfg["item_info"]
-        page_item = open_item_info_popup(page, config, timeouts["action"])
-        page_item.once("dialog", lambda dialog: dialog.dismiss())
-        select_item_in_popup(page_item, item_info_cfg["item_selection_text"], timeouts["action"])
-
-        page.once("dialog", lambda dialog: dialog.dismiss())
-        add_to_recipient_list(page, config, timeouts["action"])
-
-        page.once("dialog", lambda dialog: dialog.dismiss())
-        validate_address(page, config, timeouts["action"])
-
-        click_selector(page, "#imgBtn", timeouts["action"])
-        click_selector(page, "#btnAddr", timeouts["action"])
-        click_link_by_text(page, "다음", "#recListNextDiv", timeouts["action"])
-
-        card_cfg = process_cfg["payment"]
-        card_numbers = card_cfg["card_numbers"]
-        set_input_value(page, "#creditNo1", card_numbers[0], timeouts["action"])
-        set_input_value(page, "#creditNo2", card_numbers[1], timeouts["action"])
-        set_input_value(page, "#creditNo3", card_numbers[2], timeouts["action"])
-        set_input_value(page, "#creditNo4", card_numbers[3], timeouts["action"])
-
-        expiry = card_cfg["expiry"]
-        set_input_value(page, "#creditExp1", expiry[0], timeouts["action"])
-        set_input_value(page, "#creditExp2", expiry[1], timeouts["action"])
-
-        pwd_digits = card_cfg["password_digits"]
-        set_input_value(page, "#creditPwd1", pwd_digits[0], timeouts["action"])
-        set_input_value(page, "#creditPwd2", pwd_digits[1], timeouts["action"])
-        set_input_value(page, "#creditBirth", card_cfg["birthdate"], timeouts["action"])
-
-        click_selector(page, "#certCreditInfo", timeouts["action"])
-
-        print("Test completed successfully!")
-    except Exception as exc:
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        screenshot_name = f"{script_cfg['paths']['failure_screenshot_prefix']}_{timestamp}.png"
-        screenshot_path = progress_dir / screenshot_name
-        try:
-            page.screenshot(path=str(screenshot_path), full_page=True)
-        except Exception:
-            pass
-        error = exc
-    finally:
-        wait_for_manual_close(page, keep_open_after_run, keep_open_poll_ms)
-        context.close()
-        browser.close()
-    if error:
-        raise error
-
-
-with sync_playwright() as playwright:
-    run(playwright)
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import pickle
+import re
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
+
+import yaml
+
+try:
+    # libyaml C 확장이 있으면 파싱이 수 배 빠르다.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Playwright, TimeoutError as PlaywrightTimeoutError
+
+# Playwright sync 드라이버는 API 호출마다 파이썬 스택을 수집한다(오류 메시지용).
+# PW_INSPECT_STACK=0이면 이를 생략해 호출당 오버헤드를 줄인다. 내부 구조가 다른
+# 버전에서는 조용히 기본 동작을 유지한다.
+if os.environ.get("PW_INSPECT_STACK") == "0":
+    try:
+        import playwright._impl._connection as _pw_connection
+
+        if hasattr(_pw_connection, "capture_call_stack"):
+            _pw_connection.capture_call_stack = lambda *args, **kwargs: []
+    except Exception:
+        pass
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+log = logging.getLogger(__name__)
+
+# 헬퍼 JS는 컨텍스트 init script로 페이지당 한 번만 설치하고,
+# 각 호출은 window.__ops.* 를 부르는 짧은 래퍼만 전송한다.
+_OPS_INIT_JS = """(() => {
+    if (window.__ops) return;
+    const cache = new Map();
+    // 셀렉터 조회 결과 캐시. isConnected 검사로 탈착된 노드는 자동 무효화된다.
+    const q = (sel) => {
+        let el = cache.get(sel);
+        if (el && el.isConnected) return el;
+        el = document.querySelector(sel);
+        if (el) cache.set(sel, el); else cache.delete(sel);
+        return el;
+    };
+    window.__q = q;
+    // 진행 중인 XHR/fetch 수를 추적해 이벤트 기반 안정화 대기(wait_until_idle)에 쓴다.
+    if (window.__pendingXhr === undefined) {
+        window.__pendingXhr = 0;
+        const origSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function (...args) {
+            window.__pendingXhr++;
+            this.addEventListener('loadend', () => { window.__pendingXhr--; });
+            return origSend.apply(this, args);
+        };
+        const origFetch = window.fetch;
+        if (origFetch) {
+            window.fetch = function (...args) {
+                window.__pendingXhr++;
+                return origFetch.apply(this, args).finally(() => { window.__pendingXhr--; });
+            };
+        }
+    }
+    const reCache = new Map();
+    // 문서 전체 앵커의 라이브 HTMLCollection. DOM 변경을 자동 반영하므로
+    // 한 번만 만들어 두면 호출마다 컬렉션을 새로 얻을 필요가 없다.
+    const liveAnchors = document.getElementsByTagName('a');
+    const fire = (el, type) => el.dispatchEvent(new Event(type, { bubbles: true }));
+    const isVisible = (el) => {
+        if (!el || !el.isConnected) return false;
+        // checkVisibility는 강제 레이아웃 없이 스타일 기반으로 판정한다.
+        if (el.checkVisibility) {
+            return el.checkVisibility({ checkOpacity: true, checkVisibilityCSS: true });
+        }
+        if (el.offsetParent === null && window.getComputedStyle(el).position !== 'fixed') {
+            return false;
+        }
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    window.__ops = {
+        setInput(p) {
+            const el = q(p.selector);
+            if (!el) return false;
+            el.value = p.value;
+            fire(el, 'input');
+            fire(el, 'change');
+            return true;
+        },
+        setSelect(p) {
+            const el = q(p.selector);
+            if (!el) return false;
+            el.value = p.value;
+            fire(el, 'change');
+            return true;
+        },
+        setInputsBulk(pairs) {
+            let any = false;
+            for (const [sel, val] of pairs) {
+                if (this.setInput({ selector: sel, value: val })) any = true;
+            }
+            return any;
+        },
+        applyOps(ops) {
+            const results = [];
+            for (const op of ops) {
+                const el = q(op.selector);
+                if (!el) { results.push(false); continue; }
+                if (op.kind === 'select') {
+                    el.value = op.value;
+                    fire(el, 'change');
+                } else if (op.kind === 'input') {
+                    el.value = op.value;
+                    fire(el, 'input');
+                    fire(el, 'change');
+                } else {
+                    el.click();
+                }
+                results.push(true);
+            }
+            return results;
+        },
+        clickSelector(sel) {
+            const el = q(sel);
+            if (!el) return false;
+            el.click();
+            return true;
+        },
+        clickLinkByText(p) {
+            const root = p.container ? document.querySelector(p.container) : document;
+            if (!root) return false;
+            if (p.text.indexOf('"') === -1) {
+                // XPath 첫 매치 조회는 배열을 만들지 않고 엔진 내부에서 탐색을 끝낸다.
+                const hit = document.evaluate(
+                    './/a[contains(., "' + p.text + '")]',
+                    root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+                ).singleNodeValue;
+                if (hit) { hit.click(); return true; }
+                return false;
+            }
+            // 따옴표가 든 텍스트는 XPath 리터럴로 안전하게 못 싣는다. 루프로 폴백한다.
+            const links = root === document ? liveAnchors : root.getElementsByTagName('a');
+            for (let i = 0; i < links.length; i++) {
+                if ((links[i].textContent || '').indexOf(p.text) !== -1) {
+                    links[i].click();
+                    return true;
+                }
+            }
+            return false;
+        },
+        clickVisibleByText(p) {
+            const tokens = p.text_tokens || [];
+            // 토큰 목록을 하나의 정규식으로 컴파일해 캐시한다. 엔진 내부 매처가
+            // 토큰별 includes 반복 탐색보다 빠르고, 같은 토큰 조합은 재컴파일하지 않는다.
+            let re = null;
+            if (tokens.length) {
+                const reKey = tokens.join('\\x01');
+                re = reCache.get(reKey);
+                if (!re) {
+                    const esc = (s) => s.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&');
+                    re = new RegExp(tokens.map(esc).join('|'));
+                    reCache.set(reKey, re);
+                }
+            }
+            const matchesText = (el) => {
+                if (!re) return true;
+                return re.test((el.textContent || el.value || '').trim());
+            };
+            for (const selector of p.selectors || []) {
+                const elements = document.querySelectorAll(selector);
+                for (let i = 0; i < elements.length; i++) {
+                    const el = elements[i];
+                    if (el.disabled) continue;
+                    // 값싼 텍스트 검사를 먼저 통과시킨 뒤에만 가시성(스타일) 검사를 수행한다.
+                    if (!matchesText(el)) continue;
+                    if (!isVisible(el)) continue;
+                    el.click();
+                    return true;
+                }
+            }
+            return false;
+        },
+        finishAddressPopup(p) {
+            // 결과 링크 클릭 → 동/호 입력 → 입력 버튼 클릭을 브라우저 안에서 연속 수행한다.
+            const clickLink = (text) => this.clickLinkByText({ text: text, container: null });
+            if (!clickLink(p.result_text)) {
+                return Promise.resolve({ result: false, submit: false });
+            }
+            return new Promise((resolve) => {
+                const finish = () => {
+                    const dong = document.querySelector('input[type="text"][placeholder*="동"]');
+                    const ho = document.querySelector('input[type="text"][placeholder*="호"]');
+                    if (dong) {
+                        dong.value = p.building;
+                        fire(dong, 'input');
+                    }
+                    if (ho) {
+                        ho.value = p.unit;
+                        fire(ho, 'input');
+                    }
+                    resolve({ result: true, submit: clickLink(p.submit_text) });
+                };
+                const ready = () => !!document.querySelector('input[type="text"][placeholder*="동"]');
+                if (ready()) { finish(); return; }
+                // 동/호 입력란이 아직 없으면 폴링 대신 DOM 변이가 생기는 즉시 이어 간다.
+                const timer = setTimeout(() => { mo.disconnect(); finish(); }, p.timeout_ms || 1000);
+                const mo = new MutationObserver(() => {
+                    if (ready()) { mo.disconnect(); clearTimeout(timer); finish(); }
+                });
+                mo.observe(document.body, { childList: true, subtree: true });
+            });
+        },
+        checkAgree(text) {
+            // getElementsByTagName은 셀렉터 엔진을 거치지 않고 배열 할당도 없다.
+            const inputs = document.getElementsByTagName('input');
+            let fallback = null;
+            const apply = (checkbox) => {
+                const wasChecked = checkbox.checked;
+                if (!wasChecked) checkbox.click();
+                return { found: true, wasChecked: wasChecked, nowChecked: checkbox.checked };
+            };
+            for (let i = 0; i < inputs.length; i++) {
+                const checkbox = inputs[i];
+                if (checkbox.type !== 'checkbox') continue;
+                if (!fallback) fallback = checkbox;
+                const container = checkbox.closest('label') || checkbox.parentElement;
+                const labelText = container ? container.textContent || '' : '';
+                if (labelText.indexOf(text) !== -1) return apply(checkbox);
+            }
+            if (fallback) return apply(fallback);
+            return { found: false, wasChecked: false, nowChecked: false };
+        },
+        findAddressTrigger(p) {
+            // 공유 라이브 HTMLCollection을 한 번만 순회하며 두 조건을 함께 검사한다.
+            for (let i = 0; i < liveAnchors.length; i++) {
+                const link = liveAnchors[i];
+                if (p.onclick_contains
+                        && (link.getAttribute('onclick') || '').indexOf(p.onclick_contains) !== -1) {
+                    if (p.click) link.click();
+                    return true;
+                }
+                if (p.text_contains
+                        && (link.textContent || '').indexOf(p.text_contains) !== -1) {
+                    if (p.click) link.click();
+                    return true;
+                }
+            }
+            return false;
+        },
+    };
+})();"""
+
+# 단명 자동화 실행에 불필요한 백그라운드 네트워킹/타이머/리포팅을 끄는 기동 인자.
+# 사용자 설정 args 뒤에 덧붙여 기동 시간과 탐색당 CPU를 줄인다.
+_PERF_ARGS = (
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-breakpad",
+    "--disable-component-update",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--no-default-browser-check",
+    "--no-first-run",
+    "--metrics-recording-only",
+    "--mute-audio",
+)
+
+# 결제 카드 입력란 셀렉터. 값 배열과 순서대로 zip해 일괄 입력에 쓴다.
+_CARD_SELECTORS = (
+    "#creditNo1",
+    "#creditNo2",
+    "#creditNo3",
+    "#creditNo4",
+    "#creditExp1",
+    "#creditExp2",
+    "#creditPwd1",
+    "#creditPwd2",
+    "#creditBirth",
+)
+
+
+def _freeze(value):
+    # 설정 트리를 읽기 전용으로 고정한다. 실수로 변경하면 조용한 버그 대신
+    # 즉시 TypeError가 난다. 리스트는 튜플이 되므로 소비처는 인덱싱/순회만 한다.
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@functools.lru_cache(maxsize=1)
+def load_config() -> Mapping:
+    # 실행 중 변하지 않는 설정이므로 프로세스 수명 동안 한 번만 파싱한다.
+    config_path = ROOT / "config.yaml"
+    # YAML 파싱 결과를 mtime 기준으로 pickle 사이드카에 캐시해 재시작 비용을 줄인다.
+    cache_path = config_path.parent / (config_path.name + ".pkl")
+    stat_result = config_path.stat()
+    # mtime과 크기를 함께 기록해 mtime이 같은 덮어쓰기(빠른 연속 저장)도 감지한다.
+    meta = (stat_result.st_mtime_ns, stat_result.st_size)
+    try:
+        cached = pickle.loads(cache_path.read_bytes())
+        if cached.get("meta") == meta:
+            return _freeze(cached["data"])
+    except (OSError, pickle.PickleError, AttributeError):
+        pass
+    with config_path.open("r", encoding="utf-8") as handle:
+        data = yaml.load(handle, Loader=_YamlLoader)
+    try:
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        # MappingProxyType은 pickle이 안 되므로 고정 전의 원본 트리를 저장한다.
+        tmp_path.write_bytes(
+            pickle.dumps({"meta": meta, "data": data}, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass
+    return _freeze(data)
+
+
+# 이미 만들어 둔 폴더는 프로세스 수명 동안 mkdir 시스템콜을 다시 하지 않는다.
+_ensured_dirs: set[str] = set()
+
+
+def ensure_progress_dir(path: Path) -> None:
+    key = os.fspath(path)
+    if key in _ensured_dirs:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(key)
+
+
+_IDLE_JS = "() => !window.__pendingXhr && document.readyState === 'complete'"
+
+
+def wait_until_idle(page, max_ms: int | None) -> None:
+    # 네트워크/문서가 안정되는 즉시 반환한다. max_ms는 상한일 뿐 고정 대기가 아니다.
+    if not max_ms or max_ms <= 0:
+        return
+    try:
+        page.wait_for_function(_IDLE_JS, timeout=max_ms)
+    except (PlaywrightTimeoutError, PlaywrightError):
+        pass
+
+
+def step_delay(page, timeout_ms: int | None) -> None:
+    if timeout_ms and timeout_ms > 0:
+        if page.is_closed():
+            return
+        if timeout_ms < 25:
+            # 짧은 지연은 CDP 왕복으로 스케줄링하는 비용이 더 크므로 로컬 sleep으로 처리한다.
+            time.sleep(timeout_ms / 1000.0)
+            return
+        # 고정 수면이던 구간을 유휴 감지 대기로 바꿔, 빠른 응답에서는 수십 ms 안에 복귀한다.
+        wait_until_idle(page, timeout_ms)
+
+
+def wait_page_ready(page, selector: str, timeout_ms: int) -> None:
+    # 고정 대기 대신 다음 단계가 필요로 하는 요소가 나타나는 즉시 진행한다.
+    try:
+        page.wait_for_selector(selector, state="attached", timeout=timeout_ms)
+    except PlaywrightTimeoutError:
+        pass
+
+
+def wait_for_manual_close(page, keep_open: bool, poll_ms: int) -> None:
+    if not keep_open:
+        return
+    # sync API의 이벤트 루프는 Playwright 호출 중에만 동작하므로 파이썬 쪽
+    # Event 대기로는 close 이벤트가 영영 전달되지 않는다. 루프를 직접 구동하는
+    # wait_for_timeout 폴링으로 감지하고, 짧은 간격은 Ctrl-C 반응성을 위한 것이다.
+    wait_ms = poll_ms if poll_ms and poll_ms > 0 else 1000
+    try:
+        while not page.is_closed():
+            page.wait_for_timeout(wait_ms)
+    except (KeyboardInterrupt, PlaywrightError):
+        pass
+
+
+def set_input_value(page, selector: str, value: str, timeout_ms: int | None = None) -> bool:
+    if value is None:
+        return False
+    updated = page.evaluate(
+        "(p) => window.__ops.setInput(p)",
+        {"selector": selector, "value": value},
+    )
+    if updated:
+        step_delay(page, timeout_ms)
+    return updated
+
+
+def set_select_value(page, selector: str, value: str, timeout_ms: int | None = None) -> bool:
+    if value is None:
+        return False
+    updated = page.evaluate(
+        "(p) => window.__ops.setSelect(p)",
+        {"selector": selector, "value": value},
+    )
+    if updated:
+        step_delay(page, timeout_ms)
+    return updated
+
+
+def set_inputs_bulk(page, pairs: list[list[str]], timeout_ms: int | None = None) -> bool:
+    # 독립적인 입력 필드들을 한 번의 evaluate 왕복으로 일괄 입력한다.
+    items = [[selector, value] for selector, value in pairs if value is not None]
+    if not items:
+        return False
+    updated = page.evaluate(
+        "(pairs) => window.__ops.setInputsBulk(pairs)",
+        items,
+    )
+    if updated:
+        step_delay(page, timeout_ms)
+    return updated
+
+
+def apply_dom_ops(page, ops: list[dict], timeout_ms: int | None = None) -> list[bool]:
+    # 입력/셀렉트/클릭을 op 목록으로 받아 한 번의 evaluate 왕복으로 실행한다.
+    if not ops:
+        return []
+    results = page.evaluate("(ops) => window.__ops.applyOps(ops)", ops)
+    if any(results):
+        step_delay(page, timeout_ms)
+    return results
+
+
+def click_selector(page, selector: str, timeout_ms: int | None = None) -> bool:
+    clicked = page.evaluate(
+        "(sel) => window.__ops.clickSelector(sel)",
+        selector,
+    )
+    if clicked:
+        step_delay(page, timeout_ms)
+    return clicked
+
+
+def click_link_by_text(
+    page, text: str, container_selector: str | None = None, timeout_ms: int | None = None
+) -> bool:
+    clicked = page.evaluate(
+        "(p) => window.__ops.clickLinkByText(p)",
+        {"text": text, "container": container_selector},
+    )
+    if clicked:
+        step_delay(page, timeout_ms)
+    return clicked
+
+
+def click_visible_element_by_text(
+    page, selectors: list[str], text_tokens: list[str], timeout_ms: int | None = None
+) -> bool:
+    if not selectors:
+        return False
+    clicked = page.evaluate(
+        "(p) => window.__ops.clickVisibleByText(p)",
+        {"selectors": selectors, "text_tokens": text_tokens or []},
+    )
+    if clicked:
+        step_delay(page, timeout_ms)
+    return clicked
+
+
+def remove_modal_and_login(page, script_cfg: dict, timeout_ms: int | None = None) -> dict:
+    # 로그인 단계에서만 사용하는 설정(Working process 이전)
+    login_cfg = script_cfg["login"]
+    creds = script_cfg["credentials"]
+    # 콤마로 합친 셀렉터는 CSS 엔진이 한 번에 처리하므로 JS 루프보다 빠르고 페이로드도 작다.
+    payload = {
+        "modal_selector": login_cfg["modal_selector"],
+        "id_selector": ",".join(login_cfg["id_selectors"]),
+        "pw_selector": ",".join(login_cfg["password_selectors"]),
+        "username": creds["username"],
+        "password": creds["password"],
+    }
+    result = page.evaluate(
+        """(payload) => {
+            const modal = document.querySelector(payload.modal_selector);
+            if (modal) {
+                modal.style.display = 'none';
+                modal.remove();
+            }
+
+            const idInput = document.querySelector(payload.id_selector);
+            const pwInput = document.querySelector(payload.pw_selector);
+
+            if (idInput) {
+                idInput.value = payload.username;
+                idInput.dispatchEvent(new Event('input', { bubbles: true }));
+            }
+            if (pwInput) {
+                pwInput.value = payload.password;
+                pwInput.dispatchEvent(new Event('input', { bubbles: true }));
+            }
+
+            let submitted = false;
+            if (typeof checkVal === 'function') {
+                checkVal();
+                submitted = true;
+            } else {
+                const form = document.querySelector('#frmLogin');
+                if (form) {
+                    form.submit();
+                    submitted = true;
+                }
+            }
+
+            return {
+                id_found: !!idInput,
+                pw_found: !!pwInput,
+                submitted,
+            };
+        }""",
+        payload,
+    )
+    # 제출 후 동기화는 호출부의 wait_for_url이 담당하므로 고정 지연을 두지 않는다.
+    return result
+
+
+def _dismiss_dialog(dialog) -> None:
+    dialog.dismiss()
+
+
+def _attach_popup_dialog_policy(popup) -> None:
+    # 팝업 페이지용 기본 정책. 모듈 수준 함수라 팝업마다 클로저를 새로 만들지 않는다.
+    popup.on("dialog", _dismiss_dialog)
+
+
+def attach_dialog_handler(page, accept_contains: list[str]) -> None:
+    # 토큰별 파이썬 루프 대신 한 번 컴파일한 정규식으로 C 레벨에서 매칭한다.
+    accept_pattern = (
+        re.compile("|".join(map(re.escape, accept_contains))) if accept_contains else None
+    )
+
+    def _handler(dialog) -> None:
+        if accept_pattern and accept_pattern.search(dialog.message):
+            dialog.accept()
+        else:
+            dialog.dismiss()
+
+    page.on("dialog", _handler)
+
+
+def attach_resource_blocker(context, block_types: list[str], block_url_contains: list[str]) -> None:
+    # 폼 자동화에 불필요한 리소스(이미지/폰트 등) 요청을 차단해 로드 시간을 줄인다.
+    if not block_types and not block_url_contains:
+        return
+    type_set = set(block_types or [])
+
+    def _route(route) -> None:
+        request = route.request
+        if request.resource_type in type_set or any(
+            token in request.url for token in block_url_contains
+        ):
+            route.abort()
+        else:
+            route.continue_()
+
+    context.route("**/*", _route)
+
+
+def attach_popup_closer(context, url_contains: list[str], timeout_ms: int) -> None:
+    # 닫을 URL 토큰이 없으면 핸들러 등록 자체를 생략한다.
+    if not url_contains:
+        return
+    url_pattern = re.compile("|".join(map(re.escape, url_contains)))
+
+    def _handler(popup) -> None:
+        try:
+            # 닫을 팝업이면 로드 완료를 기다릴 필요가 없다. URL이 아직 비어 있을 때만 로드를 기다린다.
+            if not popup.url or popup.url == "about:blank":
+                try:
+                    popup.wait_for_load_state(timeout=timeout_ms)
+                except PlaywrightTimeoutError:
+                    pass
+            if url_pattern.search(popup.url):
+                popup.close()
+        except PlaywrightError:
+            pass
+
+    context.on("page", _handler)
+
+
+def toggle_address_popup_trigger(page, popup_cfg: dict, click: bool, timeout_ms: int | None = None) -> bool:
+    payload = {
+        "click": click,
+        "onclick_contains": popup_cfg["trigger_onclick_contains"],
+        "text_contains": popup_cfg["trigger_text_contains"],
+    }
+    clicked = page.evaluate(
+        "(p) => window.__ops.findAddressTrigger(p)",
+        payload,
+    )
+    if clicked and click:
+        step_delay(page, timeout_ms)
+    return clicked
+
+
+def open_address_popup(page, popup_cfg: dict, popup_timeout_ms: int, timeout_ms: int):
+    try:
+        with page.expect_popup(timeout=popup_timeout_ms) as popup_info:
+            # 존재 확인과 클릭을 한 번의 DOM 스캔으로 처리한다.
+            if not toggle_address_popup_trigger(page, popup_cfg, True, timeout_ms):
+                raise RuntimeError("주소찾기 링크를 찾지 못했습니다.")
+        return popup_info.value
+    except PlaywrightTimeoutError as exc:
+        raise RuntimeError("주소찾기 팝업이 열리지 않았습니다.") from exc
+
+
+def fill_address_popup(page, popup_cfg: dict, timeout_ms: int) -> None:
+    # 같은 셀렉터로 Locator를 두 번 만들지 않도록 입력/엔터 폴백이 하나를 공유한다.
+    keyword_input = page.locator(popup_cfg["keyword_selector"])
+    # 입력 후 안정화 대기만 생략한다. 팝업 문서는 창 생성 이후에 로드되므로
+    # 입력란 장착 대기는 Playwright 기본 타임아웃에 맡긴다.
+    keyword_input.fill(popup_cfg["keyword"], no_wait_after=True)
+    step_delay(page, timeout_ms)
+    clicked = click_visible_element_by_text(
+        page,
+        popup_cfg.get("search_button_selectors", []),
+        popup_cfg.get("search_button_text_contains", []),
+        timeout_ms,
+    )
+    if not clicked:
+        keyword_input.press("Enter")
+        step_delay(page, timeout_ms)
+    # 고정 대기 대신 검색 결과 링크가 나타나는 즉시 진행한다.
+    result_ready_selector = popup_cfg.get("result_ready_selector") or (
+        f"a:has-text(\"{popup_cfg['result_text_contains']}\")"
+    )
+    try:
+        page.wait_for_selector(result_ready_selector, timeout=timeout_ms)
+    except PlaywrightTimeoutError:
+        pass
+
+    # 결과 클릭부터 제출까지 세 번의 왕복을 한 번의 evaluate로 융합한다.
+    result = page.evaluate(
+        "(p) => window.__ops.finishAddressPopup(p)",
+        {
+            "result_text": popup_cfg["result_text_contains"],
+            "building": popup_cfg["building"],
+            "unit": popup_cfg["unit"],
+            "submit_text": popup_cfg["submit_text_contains"],
+            "timeout_ms": timeout_ms,
+        },
+    )
+    if not result["result"]:
+        raise RuntimeError("주소 검색 결과를 찾지 못했습니다.")
+    if not result["submit"]:
+        raise RuntimeError("주소 팝업 입력 버튼을 찾지 못했습니다.")
+
+
+def open_address_book_popup(page, address_book_cfg: dict, popup_timeout_ms: int, timeout_ms: int):
+    try:
+        with page.expect_popup(timeout=popup_timeout_ms) as popup_info:
+            clicked = click_link_by_text(page, address_book_cfg["search_text"], timeout_ms=timeout_ms)
+        if not clicked:
+            raise RuntimeError("주소록 검색 링크를 찾지 못했습니다.")
+        return popup_info.value
+    except PlaywrightTimeoutError as exc:
+        raise RuntimeError("주소록 팝업이 열리지 않았습니다.") from exc
+
+
+def open_item_info_popup(page, item_info_cfg: dict, popup_timeout_ms: int, timeout_ms: int):
+    try:
+        with page.expect_popup(timeout=popup_timeout_ms) as popup_info:
+            clicked = click_link_by_text(page, item_info_cfg["popup_trigger_text"], timeout_ms=timeout_ms)
+        if not clicked:
+            raise RuntimeError("물품정보 불러오기 링크를 찾지 못했습니다.")
+        return popup_info.value
+    except PlaywrightTimeoutError as exc:
+        raise RuntimeError("물품정보 팝업이 열리지 않았습니다.") from exc
+
+
+def select_item_in_popup(page, item_text: str, timeout_ms: int | None = None) -> None:
+    clicked = click_link_by_text(page, item_text, timeout_ms=timeout_ms)
+    if not clicked:
+        raise RuntimeError("물품정보 팝업에서 품목을 찾지 못했습니다.")
+    step_delay(page, timeout_ms)
+    try:
+        if page.is_closed():
+            return
+        page.close()
+    except PlaywrightError:
+        pass
+
+
+def add_to_recipient_list(page, recipient_list_cfg: dict, timeout_ms: int | None = None) -> None:
+    clicked = click_link_by_text(page, recipient_list_cfg["add_button_text"], timeout_ms=timeout_ms)
+    if not clicked:
+        raise RuntimeError("받는 분 목록에 추가 링크를 찾지 못했습니다.")
+
+
+def validate_address(page, validation_cfg: dict, timeout_ms: int | None = None) -> None:
+    clicked = click_link_by_text(page, validation_cfg["button_text"], timeout_ms=timeout_ms)
+    if not clicked:
+        raise RuntimeError("주소검증 링크를 찾지 못했습니다.")
+
+
+def address_book_is_empty(page, empty_tokens: list[str]) -> bool:
+    if not empty_tokens:
+        return False
+    return page.evaluate(
+        """(tokens) => {
+            // innerText는 강제 레이아웃을 유발하므로 textContent를 쓰고, 결과 영역으로 범위를 좁힌다.
+            const root = document.querySelector('.result, #resultArea, table tbody') || document.body;
+            const text = root ? (root.textContent || '') : '';
+            for (let i = 0; i < tokens.length; i++) {
+                if (text.indexOf(tokens[i]) >= 0) return true;
+            }
+            return false;
+        }""",
+        empty_tokens,
+    )
+
+
+def fill_manual_recipient(
+    page, recipient_cfg: dict, popup_cfg: dict, popup_timeout_ms: int, t_action: int
+) -> None:
+    set_input_value(page, 'input[name="receiverName"]', recipient_cfg["name"], t_action)
+    page2 = open_address_popup(page, popup_cfg, popup_timeout_ms, t_action)
+    fill_address_popup(page2, popup_cfg, t_action)
+    step_delay(page2, t_action)
+    page2.close()
+    phone_parts = recipient_cfg["phone"]["mobile"]
+    apply_dom_ops(
+        page,
+        [
+            {"kind": "input", "selector": 'input[name="reDetailAddr"]', "value": recipient_cfg["detail_address"]},
+            {"kind": "input", "selector": "#reCell1", "value": phone_parts[0]},
+            {"kind": "input", "selector": "#reCell2", "value": phone_parts[1]},
+            {"kind": "input", "selector": "#reCell3", "value": phone_parts[2]},
+        ],
+        t_action,
+    )
+
+
+def run(playwright: Playwright) -> None:
+    config = load_config()
+    epost_cfg = config["epost"]
+    script_cfg = epost_cfg["script"]
+    process_cfg = epost_cfg["working_process"]
+    # script_cfg: 기본 스크립트 설정 / process_cfg: 로그인 이후 작업(working process)
+    timeouts = script_cfg["timeouts_ms"]
+    # 반복 사용하는 하위 설정/타임아웃은 지역 변수로 끌어올려 중첩 조회를 줄인다.
+    browser_cfg = script_cfg["browser"]
+    paths_cfg = script_cfg["paths"]
+    urls = script_cfg["urls"]
+    parcel_cfg = process_cfg["parcel"]
+    address_popup_cfg = process_cfg["address_popup"]
+    next_ready_cfg = process_cfg.get("next_step_ready", {})
+    login_cfg = script_cfg["login"]
+    # 로그인 입력창 후보를 콤마로 합친 셀렉터는 대기/존재 확인 두 곳에서 재사용한다.
+    id_selector_union = ",".join(login_cfg["id_selectors"])
+    t_action = timeouts["action"]
+    t_stabilize = timeouts["page_stabilize"]
+    t_popup = timeouts["popup"]
+    progress_dir = ROOT / paths_cfg["progress_dir"]
+    ensure_progress_dir(progress_dir)
+    # 오류 경로에서 Path 연산/변환을 피하도록 문자열 경로를 미리 계산해 둔다.
+    progress_dir_str = os.fspath(progress_dir)
+    keep_open_after_run = browser_cfg.get("keep_open_after_run", False)
+    keep_open_poll_ms = timeouts.get("keep_open_poll_ms", 1000)
+
+    user_data_dir = browser_cfg.get("user_data_dir")
+    cdp_url = browser_cfg.get("cdp_url") or os.environ.get("EPOST_CDP_URL")
+    launch_args = [*browser_cfg["args"], *_PERF_ARGS]
+    # 뷰포트를 줄이고 배율을 1로 고정하면 렌더러의 래스터/합성 면적이 줄어든다.
+    viewport_cfg = browser_cfg.get("viewport")
+    context_kwargs: dict = {}
+    if viewport_cfg:
+        context_kwargs["viewport"] = {
+            "width": viewport_cfg["width"],
+            "height": viewport_cfg["height"],
+        }
+        context_kwargs["device_scale_factor"] = 1
+    # 단일 프로세스 모드는 팝업 창과 충돌할 수 있어 명시적으로 켠 경우에만 쓴다.
+    if browser_cfg.get("single_process", False):
+        launch_args.append("--single-process")
+    # 성공 로그인 후 쿠키/스토리지를 저장해 다음 실행에서 로그인 왕복을 건너뛴다.
+    state_path = progress_dir / "state.json"
+    shared_context = False
+    if cdp_url:
+        # 이미 떠 있는 크로미움에 CDP로 연결해 프로세스 기동/핸드셰이크 비용(수 초)을 건너뛴다.
+        cdp_browser = playwright.chromium.connect_over_cdp(cdp_url)
+        if cdp_browser.contexts:
+            context = cdp_browser.contexts[0]
+            shared_context = True
+        else:
+            context = cdp_browser.new_context()
+        browser = None
+    elif user_data_dir:
+        # 프로필을 디스크에 유지해 커넥션 풀/디스크 캐시/V8 코드 캐시를 재사용한다.
+        profile_dir = ROOT / user_data_dir
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        context = playwright.chromium.launch_persistent_context(
+            str(profile_dir),
+            headless=browser_cfg["headless"],
+            args=launch_args,
+            **context_kwargs,
+        )
+        browser = None
+    else:
+        browser = playwright.chromium.launch(
+            headless=browser_cfg["headless"],
+            args=launch_args,
+        )
+        context = browser.new_context(
+            storage_state=str(state_path) if state_path.is_file() else None,
+            **context_kwargs,
+        )
+    context.add_init_script(_OPS_INIT_JS)
+    attach_resource_blocker(
+        context,
+        browser_cfg.get("block_resource_types", []),
+        browser_cfg.get("block_url_contains", []),
+    )
+    attach_popup_closer(context, script_cfg["popups"]["close_url_contains"], timeouts["popup"])
+    page = context.new_page()
+    attach_dialog_handler(page, login_cfg["accept_dialog_contains"])
+    # 이후 열리는 팝업 페이지의 다이얼로그는 기본 dismiss 정책 하나로 처리한다.
+    # 메인 페이지 생성 뒤에 등록해 위의 수락 토큰 핸들러와 겹치지 않는다.
+    context.on("page", _attach_popup_dialog_policy)
+
+    error: Exception | None = None
+    try:
+        page.goto(urls["login"], wait_until="domcontentloaded")
+        wait_page_ready(page, id_selector_union, t_stabilize)
+
+        # 영속 프로필 사용 시 세션이 살아 있으면 로그인 폼이 없으므로 로그인 단계를 건너뛴다.
+        login_form_present = page.evaluate(
+            "(sel) => !!document.querySelector(sel)", id_selector_union
+        )
+        if login_form_present:
+            login_result = remove_modal_and_login(page, script_cfg, t_action)
+            if not login_result["id_found"] or not login_result["pw_found"]:
+                raise RuntimeError("로그인 입력창을 찾지 못했습니다.")
+            if not login_result["submitted"]:
+                raise RuntimeError("로그인 제출에 실패했습니다.")
+
+            try:
+                page.wait_for_url("**/main.retrieveMainPage.comm", timeout=timeouts["login_wait"])
+            except PlaywrightTimeoutError as exc:
+                raise RuntimeError("로그인 완료 페이지로 이동하지 못했습니다.") from exc
+
+            if not shared_context:
+                try:
+                    # 다음 실행이 로그인 없이 바로 시작하도록 세션 상태를 저장한다.
+                    context.storage_state(path=str(state_path))
+                except PlaywrightError:
+                    log.warning("세션 상태 저장에 실패했습니다: %s", state_path)
+        else:
+            log.info("기존 세션을 재사용해 로그인 단계를 건너뜁니다.")
+
+        page.goto(urls["parcel_reservation"], wait_until="domcontentloaded")
+        wait_page_ready(page, 'input[type="checkbox"]', t_stabilize)
+
+        agree_text = parcel_cfg["agree_checkbox_text"]
+        agree_state = page.evaluate("(t) => window.__ops.checkAgree(t)", agree_text)
+        if not agree_state["found"]:
+            raise RuntimeError("필수 확인 체크박스를 선택하지 못했습니다.")
+        # 이미 체크돼 있었다면 레이아웃 변화가 없으므로 안정화 지연을 건너뛴다.
+        if not agree_state["wasChecked"] and agree_state["nowChecked"]:
+            step_delay(page, t_action)
+
+        # 접수 폼의 선택/입력/저장 버튼을 한 번의 evaluate 왕복으로 일괄 처리한다.
+        parcel_results = apply_dom_ops(
+            page,
+            [
+                {"kind": "select", "selector": 'select[name="wishReceiptTime"]', "value": parcel_cfg["wish_receipt_date"]},
+                {"kind": "select", "selector": 'select[name="wishReceiptTimeNm"]', "value": parcel_cfg["wish_receipt_time"]},
+                {"kind": "select", "selector": 'select[name="pickupKeep"]', "value": parcel_cfg["pickup_keep_code"]},
+                {"kind": "input", "selector": 'input[name="pickupKeepNm"]', "value": parcel_cfg["pickup_keep_note"]},
+                {"kind": "select", "selector": "#tmpWght1", "value": parcel_cfg["weight_code"]},
+                {"kind": "select", "selector": "#tmpVol1", "value": parcel_cfg["volume_code"]},
+                {"kind": "select", "selector": "#labProductCode", "value": parcel_cfg["product_code"]},
+                {"kind": "click", "selector": "#pickupSaveBtn"},
+            ],
+            t_action,
+        )
+        required_fields = ["방문일", "방문시간", "보관방법"]
+        for field_name, applied in zip(required_fields, parcel_results):
+            if not applied:
+                raise RuntimeError(f"{field_name} 선택 필드를 찾지 못했습니다.")
+        click_link_by_text(page, "다음", "#pickupInfoDiv", t_action)
+        # 다음 단계 컨트롤이 장착되는 즉시 진행한다. 셀렉터 미지정 시 기존 지연만 적용된다.
+        if next_ready_cfg.get("after_pickup"):
+            wait_page_ready(page, next_ready_cfg["after_pickup"], t_action)
+
+        recipient_cfg = process_cfg["recipient"]
+        manual_entry_required = not recipient_cfg["use_address_book"]
+        if recipient_cfg["use_address_book"]:
+            address_book_cfg = process_cfg["address_book"]
+            page4 = open_address_book_popup(page, address_book_cfg, t_popup, t_action)
+            page4.locator("select").first.select_option(recipient_cfg["address_book_group_value"])
+            step_delay(page4, t_action)
+            page4.get_by_text(address_book_cfg["confirm_text"]).first.click()
+            step_delay(page4, t_action)
+            page4.wait_for_load_state("domcontentloaded")
+            if address_book_is_empty(page4, address_book_cfg["empty_text_contains"]):
+                manual_entry_required = True
+                step_delay(page4, t_action)
+                page4.close()
+            else:
+                # 존재 확인(count)과 클릭을 한 번의 evaluate로 합쳐 셀/링크 순으로 시도한다.
+                name_clicked = click_visible_element_by_text(
+                    page4, ["td", "a"], [recipient_cfg["name"]], t_action
+                )
+                if not name_clicked:
+                    manual_entry_required = True
+                page4.close()
+        if manual_entry_required:
+            fill_manual_recipient(
+                page, recipient_cfg, address_popup_cfg, t_popup, t_action
+            )
+
+        item_info_cfg = process_cfg["item_info"]
+        page_item = open_item_info_popup(page, item_info_cfg, t_popup, t_action)
+        select_item_in_popup(page_item, item_info_cfg["item_selection_text"], t_action)
+
+        # 메인 페이지 다이얼로그는 attach_dialog_handler가 수락/거절을 모두 처리한다.
+        add_to_recipient_list(page, process_cfg["recipient_list"], t_action)
+
+        validate_address(page, process_cfg["address_validation"], t_action)
+
+        click_selector(page, "#imgBtn", t_action)
+        click_selector(page, "#btnAddr", t_action)
+        click_link_by_text(page, "다음", "#recListNextDiv", t_action)
+        if next_ready_cfg.get("after_recipient_list"):
+            wait_page_ready(page, next_ready_cfg["after_recipient_list"], t_action)
+
+        card_cfg = process_cfg["payment"]
+        card_values = [
+            *card_cfg["card_numbers"],
+            *card_cfg["expiry"],
+            *card_cfg["password_digits"],
+            card_cfg["birthdate"],
+        ]
+        set_inputs_bulk(page, list(zip(_CARD_SELECTORS, card_values)), t_action)
+
+        click_selector(page, "#certCreditInfo", t_action)
+
+        log.info("접수 자동화 흐름을 끝까지 완료했습니다.")
+    except Exception as exc:
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        # 같은 초에 연속 실패해도 파일명이 겹치지 않도록 ns 하위 비트를 덧붙인다.
+        unique_suffix = time.time_ns() & 0xFFFF
+        screenshot_path = (
+            f"{progress_dir_str}/{paths_cfg['failure_screenshot_prefix']}"
+            f"_{timestamp}_{unique_suffix:04x}.png"
+        )
+        try:
+            # 전체 페이지 캡처는 뷰포트 스크롤 합성으로 느리다. 기본은 뷰포트만 찍고,
+            # 페이지가 멈춰 있어도 종료를 막지 않도록 타임아웃을 짧게 둔다.
+            if not page.is_closed():
+                page.screenshot(
+                    path=screenshot_path,
+                    full_page=paths_cfg.get("failure_screenshot_full_page", False),
+                    timeout=2000,
+                )
+        except Exception:
+            pass
+        log.error("실패: %s (스크린샷: %s)", exc, screenshot_path)
+        error = exc
+    finally:
+        wait_for_manual_close(page, keep_open_after_run, keep_open_poll_ms)
+        if shared_context:
+            # 공유 브라우저의 컨텍스트는 살려 두고 이번 실행이 연 페이지만 정리한다.
+            if not page.is_closed():
+                page.close()
+        else:
+            context.close()
+        if browser is not None:
+            browser.close()
+    if error:
+        raise error
+
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+try:
+    # 같은 프로세스에서 여러 스크립트 실행 시 드라이버 기동 비용을 한 번만 낸다.
+    from _driver import get_playwright
+except ImportError:
+    from tests._driver import get_playwright
+
+run(get_playwright())
@@ -1,74 +1,143 @@
-import re
-from playwright.sync_api import Playwright, sync_playwright, expect
-
-
-def run(playwright: Playwright) -> None:
-    browser = playwright.chromium.launch(headless=False)
-    context = browser.new_context()
-    page = context.new_page()
-    page.goto("https://www.epost.go.kr/usr/login/cafzc008k01.jsp?s_url=https://www.epost.go.kr")
-    page.get_by_role("link", name="국내소포").nth(1).click()
-    page.get_by_role("link", name="방문접수소포 반품예약").nth(2).click()
-    page.get_by_role("link", name="menu").click()
-    page.get_by_role("link", name="방문접수소포 방문접수예약").click()
-    page.get_by_role("checkbox", name="우편금지물품·취급제한품목 및 손해배상 안내 확인").check()
-    with page.expect_popup() as page2_info:
-        page.get_by_role("link", name="주소찾기").click()
-    page2 = page2_info.value
-    page2.get_by_role("textbox", name="검색어입력").click()
-    page2.get_by_role("textbox", name="검색어입력").fill("향군로 74번길 26")
-    page2.get_by_role("textbox", name="검색어입력").press("Enter")
-    page2.get_by_role("button", name="검색").click()
-    page2.get_by_role("link", name="충청북도 청주시 청원구 향군로74번길 26").click()
-    page2.get_by_role("textbox", name="동").click()
-    page2.get_by_role("textbox", name="동").fill("103")
-    page2.get_by_role("textbox", name="호", exact=True).click()
-    page2.get_by_role("textbox", name="호", exact=True).fill("912")
-    page2.get_by_role("link", name="주소입력").click()
-    page2.close()
-    page.get_by_title("보내는 분의 휴대전화 중간자리").click()
-    page.get_by_title("보내는 분의 휴대전화 중간자리").press("ArrowRight")
-    page.get_by_title("보내는 분의 휴대전화 중간자리").press("ArrowRight")
-    page.get_by_title("보내는 분의 휴대전화 중간자리").press("ArrowRight")
-    page.get_by_title("보내는 분의 휴대전화 중간자리").fill("3532")
-    page.get_by_title("보내는 분의 휴대전화 뒷자리").click()
-    page.get_by_title("보내는 분의 휴대전화 뒷자리").click()
-    page.get_by_title("보내는 분의 휴대전화 뒷자리").press("ArrowRight")
-    page.get_by_title("보내는 분의 휴대전화 뒷자리").press("ArrowRight")
-    page.get_by_title("보내는 분의 휴대전화 뒷자리").fill("1342")
-    page.get_by_role("link", name="다음").click()
-    page.get_by_label("방문접수일자").select_option("2026-01-02")
-    page.locator("#pickupKeep").select_option("05")
-    page.get_by_role("textbox", name="보관장소 입력").click()
-    page.get_by_role("textbox", name="보관장소 입력").fill("문 앞에 있어요")
-    page.locator("#pickupInfoDiv").get_by_role("paragraph").filter(has_text="다음").click()
-    page.locator("#pickupInfoDiv").get_by_role("link", name="다음").click()
-    with page.expect_popup() as page3_info:
-        page.get_by_role("link", name="주소록 검색").click()
-    page3 = page3_info.value
-    page3.get_by_label("그룹조건").select_option("0")
-    page3.get_by_role("link", name="확인").click()
-    page3.once("dialog", lambda dialog: dialog.dismiss())
-    page3.get_by_role("link", name="육지연").click()
-    page3.close()
-    page.get_by_role("link", name="다음").nth(2).click()
-    with page.expect_popup() as page4_info:
-        page.get_by_text("물품정보 불러오기").click()
-    page4 = page4_info.value
-    page4.once("dialog", lambda dialog: dialog.dismiss())
-    page4.get_by_role("link", name="전자제품", exact=True).click()
-    page4.close()
-    page.get_by_role("textbox", name="배송시 특이사항").fill("없을 시 010-3532-1342로 연락바랍니다. ")
-    page.once("dialog", lambda dialog: dialog.dismiss())
-    page.get_by_role("link", name="받는 분 목록에 추가").click()
-    page.once("dialog", lambda dialog: dialog.dismiss())
-    page.get_by_role("link", name="주소검증").click()
-    page.locator("#recListNextDiv").get_by_role("link", name="다음").click()
-
-    # ---------------------
-    context.close()
-    browser.close()
-
-
-with sync_playwright() as playwright:
-    run(playwright)
+import os
+from pathlib import Path
+
+from playwright.sync_api import Playwright, sync_playwright
+
+try:
+    # 변형 스크립트들이 공유하는 셀렉터 상수. 화면 변경 시 한 곳만 고친다.
+    import ui_selectors as sel
+except ImportError:
+    from tests import ui_selectors as sel
+
+# 쿠키/로컬스토리지를 저장해 두면 다음 실행은 로그인 랜딩을 다시 거치지 않는다.
+_STATE_PATH = Path(__file__).resolve().parents[1] / "progress" / "epost_state.json"
+
+
+def run(playwright: Playwright) -> None:
+    # 스크립트 전용 흐름이라 창/GPU 합성이 필요 없다. 기본은 headless로 돌리고
+    # 눈으로 확인할 때만 DEBUG=1 로 창을 띄운다.
+    browser = playwright.chromium.launch(
+        headless=not os.getenv("DEBUG"),
+        args=[
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-background-networking",
+            "--disable-renderer-backgrounding",
+        ],
+    )
+    context = browser.new_context(
+        storage_state=str(_STATE_PATH) if _STATE_PATH.is_file() else None,
+    )
+    # 폼 조작에 필요 없는 이미지/폰트/미디어와 분석 스크립트 요청을 차단해
+    # 본문과 팝업들(같은 컨텍스트라 자동 상속)의 로드 대역폭을 줄인다.
+    # 주소 검색 팝업의 결과 레이아웃이 깨질 수 있어 stylesheet는 차단하지 않는다.
+    blocked_types = {"image", "font", "media"}
+
+    def _route(route):
+        request = route.request
+        if request.resource_type in blocked_types or "google-analytics" in request.url:
+            route.abort()
+        else:
+            route.continue_()
+
+    context.route("**/*", _route)
+    # 실패가 빨리 드러나도록 기본 대기 상한을 짧게 고정한다.
+    context.set_default_navigation_timeout(15000)
+    context.set_default_timeout(10000)
+    page = context.new_page()
+    # 클릭과 다이얼로그 발생 사이의 등록 경합을 피하도록 페이지 생성 직후
+    # 상시 핸들러 하나로 모든 다이얼로그를 닫는다.
+    page.on("dialog", lambda dialog: dialog.dismiss())
+    # load 대신 DOM 파싱 완료 시점에 진행한다. 이후 fill/click이 요소 단위로 대기한다.
+    page.goto(
+        "https://www.epost.go.kr/usr/login/cafzc008k01.jsp?s_url=https://www.epost.go.kr",
+        wait_until="domcontentloaded",
+    )
+    page.get_by_role("link", name="국내소포").nth(1).click()
+    page.get_by_role("link", name="방문접수소포 반품예약").nth(2).click()
+    page.get_by_role("link", name="menu").click()
+    page.get_by_role("link", name="방문접수소포 방문접수예약").click()
+    page.get_by_role("checkbox", name="우편금지물품·취급제한품목 및 손해배상 안내 확인").check()
+    with page.expect_popup() as page2_info:
+        page.get_by_role("link", name="주소찾기").click()
+    page2 = page2_info.value
+    page2.on("dialog", lambda dialog: dialog.dismiss())
+    # 역할 기반 로케이터는 호출마다 접근성 트리를 훑는다. 셀렉터가 확실한
+    # 요소는 CSS/ID로 지정해 브라우저 네이티브 엔진으로 바로 찾는다.
+    # fill이 포커스까지 처리하므로 선행 click 왕복은 모두 제거했다.
+    # 같은 로케이터를 재구성하지 않도록 지역 변수로 한 번만 만든다.
+    search_box = page2.locator(sel.ADDR_KEYWORD_INPUT)
+    search_box.fill("향군로 74번길 26")
+    search_box.press("Enter")
+    page2.get_by_role("button", name="검색").click()
+    page2.get_by_role("link", name="충청북도 청주시 청원구 향군로74번길 26").click()
+    page2.get_by_role("textbox", name="동").fill("103")
+    page2.get_by_role("textbox", name="호", exact=True).fill("912")
+    page2.get_by_role("link", name="주소입력").click()
+    page2.close()
+    # 같은 화면의 두 전화번호 입력은 한 번의 evaluate로 묶어 CDP 왕복을 1회로 줄인다.
+    # evaluate는 요소를 기다리지 않으므로 첫 입력란의 장착만 먼저 확인한다.
+    page.wait_for_selector(sel.PHONE_MID_INPUT, state="attached")
+    page.evaluate(
+        """(d) => {
+            const set = (sel, v) => {
+                const el = document.querySelector(sel);
+                el.value = v;
+                el.dispatchEvent(new Event('input', { bubbles: true }));
+                el.dispatchEvent(new Event('change', { bubbles: true }));
+            };
+            set(d.midSel, d.mid);
+            set(d.tailSel, d.tail);
+        }""",
+        {"midSel": sel.PHONE_MID_INPUT, "mid": "3532", "tailSel": sel.PHONE_TAIL_INPUT, "tail": "1342"},
+    )
+    page.get_by_role("link", name="다음").click()
+    # select_option의 위젯 왕복 두 번 대신 evaluate 한 번으로 값과 change 이벤트만 보낸다.
+    page.wait_for_selector(sel.WISH_DATE_SELECT, state="attached")
+    page.evaluate(
+        """(d) => {
+            const set = (sel, v) => {
+                const el = document.querySelector(sel);
+                el.value = v;
+                el.dispatchEvent(new Event('change', { bubbles: true }));
+            };
+            set(d.dateSel, '2026-01-02');
+            set(d.keepSel, '05');
+        }""",
+        {"dateSel": sel.WISH_DATE_SELECT, "keepSel": sel.PICKUP_KEEP_SELECT},
+    )
+    page.locator(sel.PICKUP_KEEP_NOTE_INPUT).fill("문 앞에 있어요")
+    pickup_div = page.locator(sel.PICKUP_NEXT_CONTAINER)
+    pickup_div.get_by_role("paragraph").filter(has_text="다음").click()
+    pickup_div.get_by_role("link", name="다음").click()
+    with page.expect_popup() as page3_info:
+        page.get_by_role("link", name="주소록 검색").click()
+    page3 = page3_info.value
+    page3.on("dialog", lambda dialog: dialog.dismiss())
+    page3.get_by_label("그룹조건").select_option("0")
+    page3.get_by_role("link", name="확인").click()
+    page3.get_by_role("link", name="육지연").click()
+    page3.close()
+    page.get_by_role("link", name="다음").nth(2).click()
+    with page.expect_popup() as page4_info:
+        page.get_by_text("물품정보 불러오기").click()
+    page4 = page4_info.value
+    page4.on("dialog", lambda dialog: dialog.dismiss())
+    page4.get_by_role("link", name="전자제품", exact=True).click()
+    page4.close()
+    page.get_by_role("textbox", name="배송시 특이사항").fill("없을 시 010-3532-1342로 연락바랍니다. ")
+    page.get_by_role("link", name="받는 분 목록에 추가").click()
+    page.get_by_role("link", name="주소검증").click()
+    page.locator(sel.RECIPIENT_NEXT_CONTAINER).get_by_role("link", name="다음").click()
+
+    # ---------------------
+    # 다음 실행이 같은 세션으로 시작하도록 종료 직전에 상태를 저장한다.
+    _STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    context.storage_state(path=str(_STATE_PATH))
+    context.close()
+    browser.close()
+
+
+with sync_playwright() as playwright:
+    run(playwright)
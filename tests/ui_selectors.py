@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""epost 화면 셀렉터/로케이터 상수 모음.
+
+codegen으로 딴 문자열이 변형 스크립트마다 복제되면 화면이 바뀔 때 일부만
+고쳐져 재시도 지연(체감 수 초)의 원인이 된다. 여기서 한 번만 정의하고
+각 스크립트가 가져다 쓴다. 표준 라이브러리 selectors 모듈과 겹치지 않도록
+모듈 이름은 ui_selectors로 한다.
+"""
+
+# 주소 검색 팝업
+ADDR_KEYWORD_INPUT = 'input[name="keyword"]'
+
+# 보내는 분 전화번호 (title 속성 기반)
+PHONE_MID_TITLE = "보내는 분의 휴대전화 중간자리"
+PHONE_TAIL_TITLE = "보내는 분의 휴대전화 뒷자리"
+PHONE_MID_INPUT = f'input[title="{PHONE_MID_TITLE}"]'
+PHONE_TAIL_INPUT = f'input[title="{PHONE_TAIL_TITLE}"]'
+
+# 방문 접수 폼
+WISH_DATE_SELECT = 'select[name="wishReceiptTime"]'
+PICKUP_KEEP_SELECT = "#pickupKeep"
+PICKUP_KEEP_NOTE_INPUT = 'input[name="pickupKeepNm"]'
+
+# 단계 이동 '다음' 버튼이 들어 있는 컨테이너
+PICKUP_NEXT_CONTAINER = "#pickupInfoDiv"
+RECIPIENT_NEXT_CONTAINER = "#recListNextDiv"